@@ -0,0 +1,73 @@
+"""
+Run an alchemate workflow described by a YAML file, for example:
+
+    python run_workflow.py --config configs/simple_workflow.yaml  # vacuum λ-schedule optimization
+    python run_workflow.py --config configs/full_workflow.yaml  # calculation + convergence check
+
+The YAML file lists the system to load, the SOMD2 configuration options to set and the
+workflow steps (with their keyword arguments) to run in order. See configs/ for examples.
+
+Reading the YAML file requires pyyaml, which can be installed with the examples extra:
+
+    pip install alchemate[examples]
+"""
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an alchemate workflow.")
+    parser.add_argument(
+        "--config", required=True, help="Path to the YAML workflow description."
+    )
+    args = parser.parse_args()
+
+    import yaml
+    from somd2.config import Config
+    from alchemate.manager import WorkflowManager
+    from alchemate.context import SimulationContext
+    from alchemate.steps.base import RunBasicCalculation
+    from alchemate.steps.preprocessing import OptimizeLambdaProbabilities
+    from alchemate.steps.postprocessing import OptimizeConvergence
+    from alchemate.logger import setup_logging
+
+    STEP_REGISTRY = {
+        "RunBasicCalculation": RunBasicCalculation,
+        "OptimizeLambdaProbabilities": OptimizeLambdaProbabilities,
+        "OptimizeConvergence": OptimizeConvergence,
+    }
+
+    with open(args.config) as f:
+        workflow_config = yaml.safe_load(f)
+
+    somd2_config = Config()
+    for option, value in workflow_config.get("somd2_config", {}).items():
+        setattr(somd2_config, option, value)
+
+    context = SimulationContext(
+        system=workflow_config["system"], somd2_config=somd2_config
+    )
+
+    log_file = workflow_config.get("log_file")
+    if log_file:
+        setup_logging(log_path=f"{context.somd2_config.output_directory}/{log_file}")
+    else:
+        setup_logging()
+
+    simulation_workflow = []
+    for step_config in workflow_config["workflow"]:
+        step_kwargs = dict(step_config)
+        step_cls = STEP_REGISTRY[step_kwargs.pop("step")]
+        simulation_workflow.append(step_cls(**step_kwargs))
+
+    manager = WorkflowManager(context=context, workflow_steps=simulation_workflow)
+    final_context = manager.execute()
+
+    # Access the final context for all of the results.
+    if final_context:
+        print("\n--- Final Results ---")
+        print(f"Final analysis results: {final_context.results}")
+
+
+if __name__ == "__main__":
+    main()
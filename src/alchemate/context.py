@@ -20,12 +20,54 @@
 #####################################################################
 
 import logging
+import os
 import pickle
 from types import SimpleNamespace
 from somd2.config import Config
 
 _logger = logging.getLogger("alchemate.logger")
 
+# Resolved once, so validating a context does not need to construct a throwaway Config
+_SOMD2_CONFIG_CLS = Config
+
+_CONTEXT_FILE = "alchemate_context.pkl"
+_SYSTEM_FILE = "alchemate_system.pkl"
+
+
+def _atomic_write(path, dump):
+    """Calls dump(f) on a temporary file and atomically moves it into place at path."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        dump(f)
+    os.replace(tmp_path, path)
+
+
+class _ContextPickler(pickle.Pickler):
+    """Pickles a context while storing only a reference to its (potentially large) system."""
+
+    def __init__(self, file, system):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._system = system
+
+    def persistent_id(self, obj):
+        return "system" if obj is self._system else None
+
+
+class _ContextUnpickler(pickle.Unpickler):
+    """Unpickles a context, resolving the system reference from the sibling system file."""
+
+    def __init__(self, file, system_path):
+        super().__init__(file)
+        self._system_path = system_path
+
+    def persistent_load(self, pid):
+        if pid != "system":
+            raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
+        if not hasattr(self, "_system"):
+            with open(self._system_path, "rb") as f:
+                self._system = pickle.load(f)
+        return self._system
+
 
 class SimulationContext:
     """
@@ -49,7 +91,8 @@ class SimulationContext:
     __setattr__(name, value)
         Overrides attribute assignment to enforce immutability, except for specified mutable attributes.
     save()
-        Serializes and saves the context object to a file in the output directory.
+        Serializes and saves the context object to a file in the output directory. The system
+        is stored in a separate file which is only rewritten after the system is reassigned.
     load(path)
         Class method to load a serialized context object from a file.
 
@@ -59,7 +102,17 @@ class SimulationContext:
     - Use the `results` attribute for storing new or intermediate data during workflows.
     """
 
-    _mutable_attrs = ["system", "somd2_config", "results", "completed_steps"]
+    __slots__ = (
+        "_initialized",
+        "_system_dirty",
+        "system",
+        "somd2_config",
+        "base_directory",
+        "results",
+        "completed_steps",
+    )
+
+    _mutable_attrs = frozenset({"system", "somd2_config", "results", "completed_steps"})
 
     def __init__(self, system, somd2_config):
         """Initializes the context and its mutable attributes."""
@@ -67,19 +120,21 @@ class SimulationContext:
         # Flag for locking the instance
         self._initialized = False
 
+        # Flag for tracking whether the system needs to be written out on the next save
+        self._system_dirty = True
+
         # Perform input validation
-        if not isinstance(somd2_config, type(Config())):
+        if not isinstance(somd2_config, _SOMD2_CONFIG_CLS):
             raise TypeError(
-                f"Expected somd2_config to be an instance of {Config}, got {type(somd2_config)}"
+                f"Expected somd2_config to be an instance of {_SOMD2_CONFIG_CLS}, got {type(somd2_config)}"
             )
 
         # Define attributes
         self.system = system
         self.somd2_config = somd2_config
         self.base_directory = somd2_config.output_directory
-        self.results = (
-            SimpleNamespace()
-        )  # to allow dynamic attribute assignment, i.e. self.results.new_attribute = value
+        # to allow dynamic attribute assignment, i.e. self.results.new_attribute = value
+        self.results = SimpleNamespace()
         self.completed_steps = set()  # to track completed workflow steps
 
         # Lock the instance to prevent further modifications outside mutable properties
@@ -87,8 +142,7 @@ class SimulationContext:
 
     def __setattr__(self, name, value) -> None:
         """Override attribute setting to enforce immutability."""
-        is_initialized = hasattr(self, "_initialized") and self._initialized
-        if is_initialized and name not in self._mutable_attrs:
+        if getattr(self, "_initialized", False) and name not in self._mutable_attrs:
             raise AttributeError(
                 f"'{type(self).__name__}' attribute '{name}' is immutable. "
                 "Use the 'results' property for storing new data."
@@ -97,15 +151,44 @@ class SimulationContext:
         # If everything is fine, set the attribute
         super().__setattr__(name, value)
 
+        if name == "system":
+            super().__setattr__("_system_dirty", True)
+
+    def __setstate__(self, state):
+        """Restore slot values when unpickling, bypassing the immutability check."""
+        # Checkpoints written before __slots__ was introduced hold a plain __dict__
+        slot_state = state[1] if isinstance(state, tuple) else state
+        for name, value in slot_state.items():
+            object.__setattr__(self, name, value)
+
     def save(self):
-        """Save context to a file."""
-        output_path = f"{self.somd2_config.output_directory}/alchemate_context.pkl"
-        _logger.info(f"Saving context to {output_path}")
-        with open(output_path, "wb") as f:
-            pickle.dump(self, f)
+        """Save context to a file.
+
+        The system is written to its own file only when it has been reassigned since the
+        last save, so per-step checkpoints only re-serialize the config, results and
+        completed steps. Both files are first pickled to a temporary file which then
+        atomically replaces the previous checkpoint, so an interrupted save never leaves
+        a truncated file behind.
+        """
+        output_directory = self.somd2_config.output_directory
+        output_path = f"{output_directory}/{_CONTEXT_FILE}"
+        system_path = f"{output_directory}/{_SYSTEM_FILE}"
+
+        # Contexts restored from older checkpoints may not carry the flag yet
+        if getattr(self, "_system_dirty", True) or not os.path.exists(system_path):
+            _logger.info("Saving system to %s", system_path)
+            _atomic_write(
+                system_path,
+                lambda f: pickle.dump(self.system, f, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            super().__setattr__("_system_dirty", False)
+
+        _logger.info("Saving context to %s", output_path)
+        _atomic_write(output_path, lambda f: _ContextPickler(f, self.system).dump(self))
 
     @classmethod
     def load(cls, path):
         """Load context from a file."""
+        system_path = os.path.join(os.path.dirname(path), _SYSTEM_FILE)
         with open(path, "rb") as f:
-            return pickle.load(f)
+            return _ContextUnpickler(f, system_path).load()
@@ -19,14 +19,35 @@
 # along with alchemate. If not, see <http://www.gnu.org/licenses/>.
 #####################################################################
 
+import atexit
 import logging
 from colorlog import ColoredFormatter
 import sys
 
+# Tracks whether (and with which log file) logging has already been set up
+_CONFIGURED = False
+_CONFIGURED_LOG_PATH = None
+
+
+def _close_handlers():
+    """Closes the handlers of the alchemate logger on interpreter exit."""
+    for handler in logging.getLogger(__name__).handlers:
+        handler.close()
+
+
+atexit.register(_close_handlers)
+
 
 def setup_logging(log_path=None):
+    global _CONFIGURED, _CONFIGURED_LOG_PATH
+
     # Main runtime logger will be alchemate.logger
     logger = logging.getLogger(__name__)
+
+    # Repeated calls (re-imported scripts, notebooks) keep the existing handlers
+    if _CONFIGURED and _CONFIGURED_LOG_PATH == log_path:
+        return logger
+
     logger.setLevel(logging.DEBUG)
 
     # Prevent messages from propagating to the root logger
@@ -35,10 +56,11 @@ def setup_logging(log_path=None):
     # Remove any existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
 
-    # Create a file handler
+    # Create a file handler, the file is only opened once the first record is emitted
     if log_path:
-        file_handler = logging.FileHandler(log_path)
+        file_handler = logging.FileHandler(log_path, delay=True)
         file_handler.setLevel(logging.DEBUG)
         formatter = ColoredFormatter(
             "{asctime} {levelname} alchemate:{module}:{funcName}:{lineno} {message}",
@@ -74,4 +96,7 @@ def setup_logging(log_path=None):
     # Add a NullHandler to effectively disable it
     root_logger.addHandler(logging.NullHandler())
 
+    _CONFIGURED = True
+    _CONFIGURED_LOG_PATH = log_path
+
     return logger
@@ -19,7 +19,7 @@
 # along with alchemate. If not, see <http://www.gnu.org/licenses/>.
 #####################################################################
 
-import importlib.metadata
+import functools
 import logging
 from .steps.base import WorkflowStep
 import os
@@ -28,14 +28,21 @@ import os
 _logger = logging.getLogger("alchemate.logger")
 
 
-# a helper function to create and display the masthead
-def _display_masthead():
-    """Fetches the package version and displays a startup masthead."""
+@functools.lru_cache(maxsize=1)
+def _alchemate_version():
+    """Fetches the version of the installed package, cached after the first lookup."""
+    import importlib.metadata
+
     try:
-        # fetch the version of the installed package
-        version = importlib.metadata.version("alchemate")
+        return importlib.metadata.version("alchemate")
     except importlib.metadata.PackageNotFoundError:
-        version = "unknown"
+        return "unknown"
+
+
+# a helper function to create and display the masthead
+def _display_masthead():
+    """Displays a startup masthead with the package version."""
+    version = _alchemate_version()
 
     masthead = f"""
 +------------------------------------------------------------------------------+
@@ -81,14 +88,20 @@ class WorkflowManager:
         """Executes the workflow steps."""
         _display_masthead()
 
-        for step in self.workflow_steps:
+        # Resolve each step's name, run method and independence once per execution, so
+        # that changes made to workflow_steps after construction are still picked up
+        plan = [
+            (step.__class__.__name__, step.run, step.is_independent())
+            for step in self.workflow_steps
+        ]
+
+        context = self.context
+        for step_name, run_step, independent in plan:
             try:
-                _logger.info(f"Attempting to run step: {step.__class__.__name__}")
+                _logger.info("Attempting to run step: %s", step_name)
                 # Check if the step has been previously run
-                if step.__class__.__name__ in self.context.completed_steps:
-                    _logger.info(
-                        f"Step {step.__class__.__name__} has already been completed."
-                    )
+                if step_name in context.completed_steps:
+                    _logger.info("Step %s has already been completed.", step_name)
                     # TODO: Need to think about how to handle directories upon file restart
                     continue
 
@@ -97,30 +110,28 @@ class WorkflowManager:
                 # for steps that rely on files from previous steps, as otherwise SOMD2 will throw errors
                 # about output directories changing upon restart
 
-                if step.is_independent():
-                    step_dir = self.context.base_directory / step.__class__.__name__
+                if independent:
+                    step_dir = context.base_directory / step_name
                     _logger.debug(
-                        f"Creating separate directory for independent step: {step_dir}"
+                        "Creating separate directory for independent step: %s", step_dir
                     )
                     os.makedirs(step_dir, exist_ok=False)
-                    self.context.somd2_config.output_directory = step_dir
+                    context.somd2_config.output_directory = step_dir
 
                 # Run the step
-                step.run(self.context)
+                run_step(context)
 
-                if step.is_independent():
+                if independent:
                     # Reset the output directory back to the base directory
-                    self.context.somd2_config.output_directory = (
-                        self.context.base_directory
-                    )
+                    context.somd2_config.output_directory = context.base_directory
 
                 # Pickle the context at the end of each successful step
-                self.context.save()
+                context.save()
 
             except Exception as e:
-                _logger.error(f"Error in step {step.__class__.__name__}: {e}")
+                _logger.error("Error in step %s: %s", step_name, e)
                 _logger.error("Workflow execution failed.")
                 return None
 
-        _logger.info(f"Workflow {step.__class__.__name__} executed successfully.")
-        return self.context
+        _logger.info("Workflow executed successfully.")
+        return context
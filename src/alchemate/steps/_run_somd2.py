@@ -19,9 +19,17 @@
 # along with alchemate. If not, see <http://www.gnu.org/licenses/>.
 #####################################################################
 
+import contextlib
+import gc
 import logging
+import os
+import random
+import sys
+import tempfile
+import time
 import traceback
 import multiprocessing
+import sire as sr
 import somd2
 
 from ..context import SimulationContext
@@ -29,7 +37,81 @@ from ..context import SimulationContext
 _logger = logging.getLogger("alchemate.logger")
 
 
-def _run_somd2_workflow(context: SimulationContext, max_restarts: int = 5):
+def _resolve_start_method() -> str:
+    """Returns the start method requested with ALCHEMATE_MP_CONTEXT, or the default one."""
+    available = multiprocessing.get_all_start_methods()
+    default = "forkserver" if sys.platform == "linux" else "spawn"
+
+    requested = os.environ.get("ALCHEMATE_MP_CONTEXT")
+    if not requested:
+        return default
+    if requested not in available:
+        _logger.warning(
+            "Ignoring ALCHEMATE_MP_CONTEXT=%r, which is not one of the available start methods %s. Using '%s' instead.",
+            requested,
+            available,
+            default,
+        )
+        return default
+    return requested
+
+
+# Importing somd2 and sire takes seconds (OpenMM and CUDA bindings). On Linux,
+# SOMD2 processes are forked from a server that has already imported them, so that
+# restarts do not pay for the imports again while each attempt still gets a fresh process.
+# The start method can be overridden with the ALCHEMATE_MP_CONTEXT environment variable.
+_START_METHOD = _resolve_start_method()
+_PRELOAD_MODULES = ["sire", "somd2"]
+
+# Resolved once, rather than on every workflow run
+_MP_CTX = multiprocessing.get_context(_START_METHOD)
+if _START_METHOD == "forkserver":
+    _MP_CTX.set_forkserver_preload(_PRELOAD_MODULES)
+
+# Upper bound (in seconds) on the delay between two restart attempts
+_BACKOFF_CAP = 30.0
+
+
+@contextlib.contextmanager
+def _staged_system(system):
+    """Yields a path to the system, streaming in-memory systems to a temporary file once.
+
+    Child processes can then be handed the path on every attempt, rather than a pickled
+    copy of the full system.
+    """
+    if isinstance(system, (str, os.PathLike)):
+        yield system
+        return
+
+    with tempfile.TemporaryDirectory(prefix="alchemate_") as tmp_dir:
+        system_path = os.path.join(tmp_dir, "system.s3")
+        _logger.debug("Staging in-memory system to %s", system_path)
+        sr.stream.save(system, system_path)
+        yield system_path
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pauses cyclic garbage collection for the duration of the block, if it was enabled."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _backoff_delay(attempt: int, backoff_base: float) -> float:
+    """Returns a "full jitter" exponential backoff delay (in seconds) before a restart attempt."""
+    if backoff_base <= 0:
+        return 0.0
+    return random.uniform(0, min(_BACKOFF_CAP, backoff_base * 2**attempt))
+
+
+def _run_somd2_workflow(
+    context: SimulationContext, max_restarts: int = 5, backoff_base: float = 0.5
+):
     """Internal function to run a SOMD2 workflow. Handles the isolated process running and queuing of child SOMD2 processes.
 
     Args:
@@ -39,6 +121,9 @@ def _run_somd2_workflow(context: SimulationContext, max_restarts: int = 5):
         max_restarts : int, default=5
             Maximum number of restart attempts. Restart attempts
             attempt to resume the workflow from its last checkpoint or saved state.
+        backoff_base : float, default=0.5
+            Base delay (in seconds) of the randomised exponential backoff between restart
+            attempts, capped at 30 seconds. Set to 0 to restart immediately.
 
     Notes:
         This function is designed to be resilient to SOMD2 failures by implementing restart strategies.
@@ -49,95 +134,115 @@ def _run_somd2_workflow(context: SimulationContext, max_restarts: int = 5):
         The function utilizes multiprocessing to run the SOMD2 workflow in an isolated process.
     """
 
-    ctx = multiprocessing.get_context("spawn")
-
-    result_queue = ctx.Queue()
+    _logger.debug("Provided somd2_config: %s", context.somd2_config)
 
-    _logger.debug(f"Provided somd2_config: {context.somd2_config}")
+    # Stage the system once, so that every attempt only needs to send over a path to it
+    with _staged_system(context.system) as system:
+        result = _run_somd2_attempt(context, system)
 
-    # Create a process object for the SOMD2 workflow
-    process = ctx.Process(target=_run_somd2_process, args=(context, result_queue))
-    process.start()
+        # 2. If the result contains an error, enter the soft restart loop
+        error = result.get("error")
+        if error is None:
+            _logger.info("SOMD2 workflow completed successfully.")
+            return
 
-    _logger.debug(f"Process started with PID: {process.pid}")
-
-    # Wait for the process to complete, without timeout
-    process.join()
-
-    _logger.debug(f"Process with PID {process.pid} has completed.")
-    # Add a timeout here, in case we cannot access the result
-    result = result_queue.get(timeout=10)
-
-    # 2. If the result contains an error, enter the soft restart loop
-    if "error" in result:
-        _logger.error(f"Error occurred while running SOMD2 workflow: {result['error']}")
-        _logger.error(traceback.format_exc())
+        _logger.error("Error occurred while running SOMD2 workflow: %s", error)
+        if result.get("traceback"):
+            _logger.error(result["traceback"])
 
         # Begin soft restart loop, here we will try to restart a failed workflow
         for attempt in range(max_restarts):
-            _logger.debug(f"Starting soft attempt {attempt + 1}/{max_restarts}")
+            # Give transient failures (e.g. a busy GPU) time to clear before restarting
+            delay = _backoff_delay(attempt, backoff_base)
+            if delay > 0:
+                _logger.debug("Waiting %.2f s before restarting SOMD2 workflow", delay)
+                time.sleep(delay)
+
+            _logger.debug("Starting soft attempt %d/%d", attempt + 1, max_restarts)
 
             context.somd2_config.restart = True
 
-            process = ctx.Process(
-                target=_run_somd2_process, args=(context, result_queue)
-            )
-            process.start()
-            _logger.debug(f"Process started with PID: {process.pid}")
-            process.join()
-            _logger.debug(f"Process with PID {process.pid} has completed.")
-
-            try:
-                result = result_queue.get(timeout=10)
-            except Exception as e:
-                _logger.error(f"SOMD2 workflow timed out: {e}")
-                continue
-
-            if "error" in result:
-                _logger.error(
-                    f"Error occurred while running SOMD2 workflow: {result['error']}"
-                )
-                _logger.error(traceback.format_exc())
-
-                # 3. Continue soft restart attempts
-                continue
-            else:
+            result = _run_somd2_attempt(context, system)
+
+            error = result.get("error")
+            if error is None:
                 _logger.info("SOMD2 workflow completed successfully.")
                 return
 
-    elif "success" in result:
-        _logger.info("SOMD2 workflow completed successfully.")
-        return
+            # 3. Continue soft restart attempts
+            _logger.error("Error occurred while running SOMD2 workflow: %s", error)
+            if result.get("traceback"):
+                _logger.error(result["traceback"])
+
+        # 4. If we reach here, it means every attempt has failed
+        _logger.error("All attempts to run SOMD2 workflow have failed.")
+        raise RuntimeError("SOMD2 workflow failed after multiple attempts.")
+
+
+def _run_somd2_attempt(context: SimulationContext, system):
+    """Runs a single SOMD2 attempt in a child process and returns its result dictionary."""
+    # There is exactly one child and one message per attempt, so a one-way pipe is
+    # enough, without the feeder thread and locking of a multiprocessing.Queue
+    result_recv, result_send = _MP_CTX.Pipe(duplex=False)
+
+    # Create a process object for the SOMD2 workflow, only the config and the system
+    # path need to be pickled over to the child
+    process = _MP_CTX.Process(
+        target=_run_somd2_process, args=(context.somd2_config, system, result_send)
+    )
+    # Starting the child pickles its arguments, keep gen-2 collections out of the way
+    with _gc_paused():
+        process.start()
+
+    # Drop the parent's copy of the sending end, so that recv() sees EOF if the child
+    # exits without reporting a result
+    result_send.close()
+
+    _logger.debug("Process started with PID: %s", process.pid)
+
+    try:
+        result = result_recv.recv()
+    except EOFError:
+        result = None
+    finally:
+        result_recv.close()
 
-    # 4. If we reach here, it means every attempt has failed
-    _logger.error("All attempts to run SOMD2 workflow have failed.")
-    raise RuntimeError("SOMD2 workflow failed after multiple attempts.")
+    # Wait for the process to complete, without timeout
+    process.join()
+
+    _logger.debug("Process with PID %s has completed.", process.pid)
 
+    if result is None:
+        result = {
+            "error": f"SOMD2 process exited with code {process.exitcode} without reporting a result."
+        }
+    return result
 
-def _run_somd2_process(context: SimulationContext, result_queue: multiprocessing.Queue):
+
+def _run_somd2_process(somd2_config, system, result_conn):
     """
     Execute SOMD2 simulation in an isolated process.
 
     Args:
-        context (SimulationContext): Contains the SOMD2 configuration and system setup
-            required for the simulation, including somd2_config and system attributes.
-        result_queue (multiprocessing.Queue): Queue for inter-process communication to
-            return simulation results or error information to the parent process.
+        somd2_config (somd2.config.Config): The SOMD2 configuration for the simulation.
+        system (str): Path to the stream file of the system to simulate.
+        result_conn (multiprocessing.connection.Connection): Sending end of a pipe used
+            to return simulation results or error information to the parent process.
 
     Note:
         This function is designed to be used with multiprocessing and should not be
         called directly. It handles all exceptions internally to prevent process crashes.
     """
-    runner = somd2.runner.RepexRunner(
-        config=context.somd2_config, system=context.system
-    )
-    _logger.debug(f"Initialized runner with: {runner}")
-    _logger.debug(f"SOMD2 configuration: {context.somd2_config}")
+    runner = somd2.runner.RepexRunner(config=somd2_config, system=system)
+    _logger.debug("Initialized runner with: %s", runner)
+    _logger.debug("SOMD2 configuration: %s", somd2_config)
     try:
         runner.run()
-        result_queue.put({"success": True})
+        result_conn.send({"success": True})
 
     except Exception as e:
-        _logger.error(f"Error occurred while running SOMD2 workflow: {e}")
-        _logger.error(traceback.format_exc())
-        result_queue.put({"error": str(e)})
+        _logger.error("Error occurred while running SOMD2 workflow: %s", e)
+        # Format the traceback here, while the exception is still being handled
+        tb = traceback.format_exc()
+        _logger.error(tb)
+        result_conn.send({"error": str(e), "traceback": tb})
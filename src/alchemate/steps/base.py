@@ -19,6 +19,7 @@
 # along with alchemate. If not, see <http://www.gnu.org/licenses/>.
 #####################################################################
 
+import sys
 from abc import ABC, abstractmethod
 from ..context import SimulationContext
 from ._run_somd2 import _run_somd2_workflow
@@ -46,6 +47,13 @@ class WorkflowStep(ABC):
     None defined in the base class.
     """
 
+    __slots__ = ("_independent",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Resolve the name recorded in completed_steps once per class, not on every run
+        cls._step_name = sys.intern(cls.__name__)
+
     def __init__(
         self,
         independent: bool = False,
@@ -63,8 +71,7 @@ class WorkflowStep(ABC):
         self._execute(context)
 
         # Mark step as completed
-        step_name = self.__class__.__name__
-        context.completed_steps.add(step_name)
+        context.completed_steps.add(self._step_name)
 
     @abstractmethod
     def _execute(self, context: SimulationContext):
@@ -74,6 +81,8 @@ class WorkflowStep(ABC):
 class RunBasicCalculation(WorkflowStep):
     """A step to run a basic SOMD2 calculation."""
 
+    __slots__ = ("calculation_runtime",)
+
     def __init__(
         self,
         independent: bool = False,
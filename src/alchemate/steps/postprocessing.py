@@ -21,11 +21,15 @@
 
 
 import logging
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import BioSimSpace.FreeEnergy as BSS
-from alchemlyb import convergence, visualisation, estimators, preprocessing
-from alchemlyb.postprocessors.units import to_kcalmol
-import matplotlib.pyplot as plt
+import alchemlyb
+from alchemlyb import visualisation, estimators, preprocessing
+from alchemlyb.postprocessors.units import R_kJmol, kJ2kcal, to_kcalmol
+from matplotlib.figure import Figure
 import pandas as pd
 import sire as sr
 import seaborn as sns
@@ -36,11 +40,122 @@ from rich.console import Console
 from rich.table import Table
 
 from .base import WorkflowStep
-from ..context import SimulationContext
+from ..context import SimulationContext, _atomic_write
 from ._run_somd2 import _run_somd2_workflow
 
 _logger = logging.getLogger("alchemate.logger")
 
+# Number of data fractions shown in the convergence and PMF evolution plots
+_PLOT_FRACTIONS = 10
+
+# Checkpoint of the extracted dataframes, written to the SOMD2 output directory
+_EXTRACT_CACHE_FILE = ".alchemate_extract_cache.pkl"
+
+
+def _scan_parquet_files(root):
+    """Recursively collects sorted (path, stat) pairs of the parquet files under root."""
+    found = []
+    directories = [os.fspath(root)]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith(".parquet") and entry.is_file():
+                    found.append((entry.path, entry.stat()))
+
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def _forward_backward_convergence(
+    df_list, initial_f_k="BAR", num: int = 10, error_tol: float = 3
+):
+    """
+    MBAR forward and backward convergence of the free energy estimate.
+
+    Follows alchemlyb.convergence.forward_backward_convergence, but the first fit is
+    started from initial_f_k, so that a guess from a previous analysis can be reused.
+    Each subsequent fit is started from the result of the one before it.
+
+    Returns:
+    - convergence_df (pd.DataFrame): Forward, Forward_Error, Backward, Backward_Error and
+      data_fraction columns, in units of kT.
+    - f_k (np.ndarray): Dimensionless free energies of the fit on all of the data.
+    """
+    mbar = estimators.MBAR(initial_f_k=initial_f_k)
+
+    # Concatenate once, each fraction is then selected from it with a boolean mask
+    combined_df = alchemlyb.concat(df_list)
+    lengths = np.array([len(data) for data in df_list])
+    window_lengths = np.repeat(lengths, lengths)
+    window_positions = np.arange(len(combined_df.index)) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+
+    def estimate(mask):
+        sample = combined_df.iloc[mask]
+        mbar.fit(sample)
+        mbar.initial_f_k = mbar.delta_f_.iloc[0, :]
+        mean = mbar.delta_f_.iloc[0, -1]
+        error = mbar.d_delta_f_.iloc[0, -1]
+        if error > error_tol:
+            _logger.warning(
+                "Statistical error (%s) bigger than error tolerance (%s), using bootstrap error instead.",
+                error,
+                error_tol,
+            )
+            bootstrap = estimators.MBAR(n_bootstraps=50, initial_f_k=mbar.initial_f_k)
+            bootstrap.fit(sample)
+            error = bootstrap.d_delta_f_.iloc[0, -1]
+        return mean, error
+
+    # Same per-window sample counts as the data[: len(data) // num * i] and
+    # data[-len(data) // num * i :] slices used by alchemlyb, the latter of which
+    # rounds the step up
+    forward_step = window_lengths // num
+    backward_step = -(-window_lengths // num)
+    forward = [estimate(window_positions < forward_step * i) for i in range(1, num + 1)]
+    f_k = mbar.delta_f_.iloc[0].to_numpy()
+    backward = [
+        estimate(window_positions >= window_lengths - backward_step * i)
+        for i in range(1, num + 1)
+    ]
+
+    convergence_df = pd.DataFrame(
+        {
+            "Forward": [mean for mean, _ in forward],
+            "Forward_Error": [error for _, error in forward],
+            "Backward": [mean for mean, _ in backward],
+            "Backward_Error": [error for _, error in backward],
+            "data_fraction": [i / num for i in range(1, num + 1)],
+        }
+    )
+    convergence_df.attrs = df_list[0].attrs
+    return convergence_df, f_k
+
+
+def _convergence_to_kcalmol(convergence_df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the energy columns of a convergence DataFrame to kcal/mol, in place.
+
+    Unlike to_kcalmol on the whole DataFrame, data_fraction is left unconverted.
+    """
+    energy_columns = convergence_df.columns.drop("data_fraction")
+    if convergence_df.attrs.get("energy_unit") == "kT":
+        # Scale by kT in kcal/mol directly, as to_kcalmol would, without copying the frame
+        kt_kcalmol = R_kJmol * convergence_df.attrs["temperature"] * kJ2kcal
+        convergence_df[energy_columns] *= kt_kcalmol
+    else:
+        convergence_df[energy_columns] = to_kcalmol(convergence_df[energy_columns])
+    convergence_df.attrs["energy_unit"] = "kcal/mol"
+    return convergence_df
+
+
+def _rounded_results(dg_estimate: float, heuristics: dict) -> dict:
+    """Returns dG and the heuristics keyed by name, all rounded to two decimals at once."""
+    values = np.round([dg_estimate, *heuristics.values()], decimals=2).tolist()
+    return dict(zip(["dG", *heuristics], values))
+
 
 class OptimizeConvergence(WorkflowStep):
     """
@@ -56,6 +171,9 @@ class OptimizeConvergence(WorkflowStep):
     optimization_heuristics (dict): Heuristics for determining convergence (e.g., estimator error) and their thresholds.
     optimization_runtime (str): Amount of simulation time to add per optimization attempt.
     plot_convergence (bool): Whether to plot convergence results.
+    report_decorrelated (bool): Whether to also report results for the decorrelated data once converged.
+    checkpoint_extraction (bool): Whether to checkpoint the extracted energies to the output directory when
+        the step finishes, so that a later run in the same directory does not need to parse them again.
 
     Methods
     -------
@@ -65,12 +183,18 @@ class OptimizeConvergence(WorkflowStep):
     _estimate_convergence(context):
         Calculates current free energy convergence using extracted data and MBAR estimator.
 
+    _plot_convergence(context, convergence_df, extracted_dfs):
+        Plots the dG convergence, overlap matrix and PMF evolution once converged.
+
     _test_for_convergence(df):
         Tests if the estimator error in the provided DataFrame is below the optimization threshold.
 
     _compute_heuristics(convergence_df):
         Calculates various heuristics from the provided alchemlyb convergence DataFrame.
 
+    _iter_heuristics(convergence_df):
+        Lazily yields the same heuristics, so that testing can stop at the first unsatisfied one.
+
     _execute(context):
         Runs the optimization loop, extending simulation runtime and restarting as needed until
         convergence is achieved or the maximum number of attempts is reached.
@@ -83,6 +207,8 @@ class OptimizeConvergence(WorkflowStep):
         optimization_heuristics: dict = None,
         optimization_runtime: str = "1000ps",
         plot_convergence: bool = True,
+        report_decorrelated: bool = True,
+        checkpoint_extraction: bool = False,
     ) -> None:
         super().__init__(independent=independent)
 
@@ -96,70 +222,158 @@ class OptimizeConvergence(WorkflowStep):
         self.dg_estimate = None
         self.decorr_dg_estimate = None
         self.plot_convergence: bool = plot_convergence
+        self.report_decorrelated: bool = report_decorrelated
+        self.checkpoint_extraction: bool = checkpoint_extraction
+
+        # Unit strings parsed once, rather than on every optimization attempt
+        self._optimization_runtime = sr.u(optimization_runtime)
+        self._temperature = None
+
+        # Extracted dataframes keyed by path, stored with the (size, mtime) they were
+        # extracted at, so that they can be reused across optimization attempts
+        self._extract_cache: dict[str, tuple[int, int, pd.DataFrame]] = {}
+
+        # MBAR free energies from the previous attempt, used as the next initial guess
+        self._last_f_k: dict[str, np.ndarray] = {}
 
     def _extract_somd2_parquet(self, context: SimulationContext):
         """
         Extracts energies from SOMD2 parquet files.
 
+        Files that have not changed since the previous call (same modification time and size)
+        are not parsed again, their cached dataframes are reused instead. The remaining files
+        are parsed concurrently, as parquet decoding releases the GIL. With checkpoint_extraction,
+        the cache is first seeded from the checkpoint left in the output directory by a previous run.
+
         Returns:
         - extracted_dfs (list): A list of dataframes containing the extracted results for work directory.
         """
 
-        temperature = sr.u(context.somd2_config.temperature).value()
-        extracted_dfs = []
-        glob_path = Path(context.somd2_config.output_directory)
-        files = sorted(glob_path.glob("**/*.parquet"))
+        temperature = self._temperature_value(context)
+        if self.checkpoint_extraction and not self._extract_cache:
+            self._extract_cache = self._load_extract_cache(
+                self._extract_cache_path(context), temperature
+            )
 
-        for f in files:
-            path = Path(f)
-            extracted_df = BSS.Relative._somd2_extract(path, T=temperature)
-            extracted_dfs.append(extracted_df)
+        files = _scan_parquet_files(context.somd2_config.output_directory)
+
+        # Only keep the current files, so that stale extractions are released
+        cache = {}
+        pending = []
+        for path, stat in files:
+            cached = self._extract_cache.get(path)
+            if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+                cache[path] = cached
+            else:
+                pending.append((path, stat))
+
+        if pending:
+            _logger.debug("Extracting %d of %d parquet files", len(pending), len(files))
+            # One thread per pending file, which is usually one per lambda window
+            with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+                parsed = executor.map(
+                    lambda path: BSS.Relative._somd2_extract(Path(path), T=temperature),
+                    [path for path, _ in pending],
+                )
+                for (path, stat), df in zip(pending, parsed):
+                    cache[path] = (stat.st_size, stat.st_mtime_ns, df)
+        self._extract_cache = cache
+
+        extracted_dfs = [cache[path][2] for path, _ in files]
 
         return extracted_dfs
 
+    @staticmethod
+    def _extract_cache_path(context: SimulationContext) -> str:
+        """Returns the path of the extraction checkpoint in the output directory."""
+        return os.path.join(context.somd2_config.output_directory, _EXTRACT_CACHE_FILE)
+
+    def _save_extract_cache(self, context: SimulationContext):
+        """Checkpoints the extracted dataframes once, for a later run to pick up."""
+        if not self._extract_cache:
+            return
+        cache_path = self._extract_cache_path(context)
+        _logger.debug("Checkpointing extracted energies to %s", cache_path)
+        checkpoint = {
+            "temperature": self._temperature_value(context),
+            "dataframes": self._extract_cache,
+        }
+        _atomic_write(
+            cache_path,
+            lambda f: pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+
+    @staticmethod
+    def _load_extract_cache(cache_path: str, temperature: float) -> dict:
+        """Loads the extracted dataframes checkpointed by a previous run, if still valid."""
+        try:
+            with open(cache_path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            _logger.warning(
+                "Ignoring unreadable extraction cache %s: %s", cache_path, e
+            )
+            return {}
+
+        if checkpoint.get("temperature") != temperature:
+            _logger.debug("Ignoring extraction cache for a different temperature")
+            return {}
+        return checkpoint["dataframes"]
+
+    def _temperature_value(self, context: SimulationContext) -> float:
+        """Returns the simulation temperature value, parsed once per temperature string."""
+        temperature = context.somd2_config.temperature
+        if self._temperature is None or self._temperature[0] != temperature:
+            self._temperature = (temperature, sr.u(temperature).value())
+        return self._temperature[1]
+
     def _compute_heuristics(self, convergence_df: pd.DataFrame) -> dict:
         """Estimate heuristics from the provided DataFrame."""
-        implemented_heuristics = ["estimator_error", "dg_slope"]
-        heuristics = {}
+        return dict(self._iter_heuristics(convergence_df))
 
-        _logger.debug(f"Convergence dataframe:\n {convergence_df}")
+    def _iter_heuristics(self, convergence_df: pd.DataFrame):
+        """Lazily yields (heuristic, value) pairs from the provided DataFrame, cheapest first."""
+        # Ordered from the cheapest to the most expensive to compute
+        implemented_heuristics = ["estimator_error", "dg_slope"]
 
-        for key, threshold in self.optimization_heuristics.items():
+        for key in self.optimization_heuristics:
             if key not in implemented_heuristics:
                 raise NotImplementedError(f"Heuristic {key} is not implemented.")
 
+        _logger.debug("Convergence dataframe:\n %s", convergence_df)
+
+        for key in implemented_heuristics:
+            if key not in self.optimization_heuristics:
+                continue
+
             if key == "estimator_error":
                 _logger.debug("Calculating estimator error heuristic")
                 estimator_error = convergence_df["Forward_Error"].iloc[-1]
                 _logger.info(
-                    f"Free energy estimator error: {estimator_error:.4f} kcal/mol"
+                    "Free energy estimator error: %.4f kcal/mol", estimator_error
                 )
-                heuristics[key] = estimator_error
+                yield key, estimator_error
 
             if key == "dg_slope":
                 _logger.debug("Calculating dG slope heuristic")
                 try:
-                    forward_1 = convergence_df.loc[
-                        convergence_df["data_fraction"] == 1.0, "Forward"
-                    ]
-                    forward_05 = convergence_df.loc[
-                        convergence_df["data_fraction"] == 0.5, "Forward"
-                    ]
-                    if forward_1.empty or forward_05.empty:
+                    # Mask the underlying arrays directly, rather than building filtered frames
+                    data_fraction = convergence_df["data_fraction"].to_numpy()
+                    forward = convergence_df["Forward"].to_numpy()
+                    forward_1 = forward[data_fraction == 1.0]
+                    forward_05 = forward[data_fraction == 0.5]
+                    if forward_1.size == 0 or forward_05.size == 0:
                         raise ValueError(
                             "Required data_fraction values (1.0 and/or 0.5) are missing in convergence_df."
                         )
-                    dg_slope = forward_1.to_numpy()[0] - forward_05.to_numpy()[0]
-                    dg_slope = np.absolute(dg_slope)
-                    _logger.info(f"dG slope: {dg_slope:.4f} kcal/mol")
-                    heuristics[key] = dg_slope
+                    dg_slope = np.absolute(forward_1[0] - forward_05[0])
+                    _logger.info("dG slope: %.4f kcal/mol", dg_slope)
                 except Exception as e:
-                    _logger.error(f"Error calculating dG slope heuristic: {e}")
-                    heuristics[key] = np.nan
-                    _logger.info(f"dG slope: {dg_slope:.4f} kcal/mol")
-                    heuristics[key] = dg_slope
-
-        return heuristics
+                    _logger.error("Error calculating dG slope heuristic: %s", e)
+                    dg_slope = np.nan
+                yield key, dg_slope
 
     def _estimate_convergence(self, context: SimulationContext):
         """Internal function to calculate current free energy convergence."""
@@ -167,56 +381,57 @@ class OptimizeConvergence(WorkflowStep):
         try:
             extracted_dfs = self._extract_somd2_parquet(context)
         except Exception as e:
-            _logger.error(f"Error reading extracted data: {e}")
+            _logger.error("Error reading extracted data: %s", e)
 
         if not extracted_dfs:
             raise RuntimeError(
                 "No extracted dataframes available for convergence analysis."
             )
 
-        # Perform decorrelation analysis
-        extracted_decorrelated_dfs = [
-            preprocessing.decorrelate_u_nk(df) for df in extracted_dfs
-        ]
-
-        convergence_df = convergence.forward_backward_convergence(
-            extracted_dfs, estimator="MBAR"
-        )
-        try:
-            convergence_decorrelated_df = convergence.forward_backward_convergence(
-                extracted_decorrelated_dfs, estimator="MBAR"
-            )
-        except ValueError as e:
-            _logger.error(f"Error in decorrelated convergence calculation: {e}")
-            _logger.error("Falling back to using original convergence data.")
-            convergence_decorrelated_df = convergence_df.copy()
-
-        # Need to retain data_fraction as the as to_kcalmol function will also convert it
-        data_fraction = convergence_df["data_fraction"].copy()
-        convergence_df = to_kcalmol(convergence_df)
+        convergence_df = self._forward_backward_convergence("correlated", extracted_dfs)
 
-        # Reinsert the datafraction
-        convergence_df["data_fraction"] = data_fraction
-        convergence_decorrelated_df = to_kcalmol(convergence_decorrelated_df)
-        convergence_decorrelated_df["data_fraction"] = data_fraction
+        convergence_df = _convergence_to_kcalmol(convergence_df)
 
         # Retrieve and store current dG values
         self.dg_estimate = convergence_df["Forward"].iloc[-1]
-        self.decorr_dg_estimate = convergence_decorrelated_df["Forward"].iloc[-1]
 
+        # Compare the heuristics with user-defined thresholds as they are calculated, so
+        # that the remaining ones are skipped once one of them is not satisfied
         _logger.info("Computing heuristics for the unprocessed data")
-        estimated_heuristics = self._compute_heuristics(convergence_df)
-        self.estimated_heuristics = estimated_heuristics
-        _logger.info("Computing heuristics for the decorrelated data")
-        estimated_decorr_heuristics = self._compute_heuristics(
-            convergence_decorrelated_df
+        self.estimated_heuristics = {}
+        converged = self._test_for_convergence(
+            self._iter_heuristics(convergence_df), computed=self.estimated_heuristics
         )
-        self.estimated_decorr_heuristics = estimated_decorr_heuristics
 
-        # Compare the calculated heuristics with user-defined thresholds here
-        converged = self._test_for_convergence(estimated_heuristics)
+        # The decorrelated results are only reported once converged
+        self.decorr_dg_estimate = None
+        self.estimated_decorr_heuristics = None
+        if converged and self.report_decorrelated:
+            self._estimate_decorrelated_convergence(extracted_dfs, convergence_df)
 
         if converged and self.plot_convergence:
+            # The convergence plot is drawn at a finer resolution than the heuristics need
+            plot_convergence_df = _convergence_to_kcalmol(
+                self._forward_backward_convergence(
+                    "correlated", extracted_dfs, num=_PLOT_FRACTIONS
+                )
+            )
+            self._plot_convergence(context, plot_convergence_df, extracted_dfs)
+
+        return converged
+
+    def _plot_convergence(
+        self,
+        context: SimulationContext,
+        convergence_df: pd.DataFrame,
+        extracted_dfs: list,
+    ):
+        """Plots the dG convergence, overlap matrix and PMF evolution to the output directory.
+
+        Each figure is written out in the background while the next one is being prepared.
+        """
+        saved = []
+        with ThreadPoolExecutor(max_workers=3) as plot_writer:
             _logger.info("Plotting convergence results")
             sns.set_context("notebook", font_scale=1.5)
             # Now we need to plot:
@@ -226,23 +441,37 @@ class OptimizeConvergence(WorkflowStep):
 
             # Step 1. Plot dG convergence plot
             _logger.debug("Plotting dG convergence")
-            fig, ax = plt.subplots(figsize=(10, 10))
+            fig = Figure(figsize=(10, 10))
+            ax = fig.subplots()
             ax = visualisation.plot_convergence(convergence_df, ax=ax)
             ax.set_ylabel(r"$\Delta G$ (kcal/mol)")
             fig.tight_layout()
-            fig.savefig(f"{context.somd2_config.output_directory}/convergence_plot.png")
+            saved.append(
+                plot_writer.submit(
+                    fig.savefig,
+                    f"{context.somd2_config.output_directory}/convergence_plot.png",
+                )
+            )
 
             # Step 2. Plot overlap matrix
             _logger.debug("Plotting overlap matrix")
-            fig, ax = plt.subplots(figsize=(10, 10))
+            fig = Figure(figsize=(10, 10))
+            ax = fig.subplots()
 
             # Concat dataframes for the estimator
             extracted_df = pd.concat(extracted_dfs)
-            mbar = estimators.MBAR()
+
+            # Start from the free energies of the convergence analysis on the same data
+            mbar = estimators.MBAR(initial_f_k=self._last_f_k["correlated"])
             mbar.fit(extracted_df)
             ax = visualisation.plot_mbar_overlap_matrix(mbar.overlap_matrix, ax=ax)
             fig.tight_layout()
-            fig.savefig(f"{context.somd2_config.output_directory}/overlap_matrix.png")
+            saved.append(
+                plot_writer.submit(
+                    fig.savefig,
+                    f"{context.somd2_config.output_directory}/overlap_matrix.png",
+                )
+            )
 
             # Step 3. Plot the PMF evolution
             _logger.debug("Plotting PMF evolution")
@@ -252,110 +481,167 @@ class OptimizeConvergence(WorkflowStep):
             index_length = len(extracted_df.index)
             index_length = int(index_length / len(extracted_dfs))
 
-            fractions = 10
-            fraction_values = []
-            pmfs = []
-            for i in range(1, fractions + 1):
-                fraction_value = i / fractions
-                subsampled_dfs = []
+            fractions = _PLOT_FRACTIONS
+            fraction_values = [i / fractions for i in range(1, fractions + 1)]
+            pmfs = np.empty((fractions, mbar.delta_f_.shape[1]), dtype=np.float64)
+
+            # Go from the largest fraction to the smallest, so that each fit can be started
+            # from the free energies of the previous, slightly larger one
+            fraction_mbar = mbar
+
+            # Position of each sample within its lambda window, any trailing samples
+            # beyond the last full window are never selected
+            window_positions = np.arange(len(extracted_df.index)) % index_length
+            window_positions[index_length * len(extracted_dfs) :] = index_length
 
-                samples_drawn = int(index_length * fraction_value)
+            for i in reversed(range(fractions)):
+                samples_drawn = int(index_length * fraction_values[i])
 
-                # Figure out starting index value for each lambda window
-                for j in range(len(extracted_dfs)):
-                    start_index = j * index_length
-                    end_index = start_index + samples_drawn
-                    subsampled_dfs.append(extracted_df.iloc[start_index:end_index])
+                # Select the first samples_drawn samples of each lambda window
+                mask = window_positions < samples_drawn
 
-                # Do dG estimation on the subsampled data
-                combined_df = pd.concat(subsampled_dfs)
-                mbar = estimators.MBAR()
-                mbar.fit(combined_df)
+                # Do dG estimation on the subsampled data, all of the data has already
+                # been fitted for the overlap matrix
+                if not mask.all():
+                    initial_f_k = fraction_mbar.delta_f_.iloc[0].to_numpy()
+                    fraction_mbar = estimators.MBAR(initial_f_k=initial_f_k)
+                    fraction_mbar.fit(extracted_df.iloc[mask])
 
                 # Convert to kcal/mol
-                delta_f_ = to_kcalmol(mbar.delta_f_)
-                pmf = delta_f_.loc[0.0].to_numpy()
-                pmfs.append(pmf)
-                fraction_values.append(fraction_value)
-
-            pmf_df = pd.DataFrame({"fraction": fraction_values, "pmf": pmfs})
-
-            fig, ax = plt.subplots(figsize=(10, 10))
-            for i in range(len(pmf_df)):
-                lambda_vals = [i for i in range(len(pmf_df.iloc[i]["pmf"]))]
-                sns.lineplot(
-                    x=lambda_vals,
-                    y=pmf_df.iloc[i]["pmf"],
-                    ax=ax,
-                    label=f"Fraction {pmf_df.iloc[i]['fraction']}",
-                )
+                delta_f_ = to_kcalmol(fraction_mbar.delta_f_)
+                pmfs[i] = delta_f_.loc[0.0].to_numpy()
+
+            # Draw every fraction in a single call, one line per column
+            fig = Figure(figsize=(10, 10))
+            ax = fig.subplots()
+            lines = ax.plot(np.arange(pmfs.shape[1]), pmfs.T)
 
             ax.set_title("PMF evolution")
             ax.set_xlabel("Lambda window")
             ax.set_ylabel("PMF (kcal/mol)")
-            ax.legend()
+            ax.legend(lines, [f"Fraction {fraction}" for fraction in fraction_values])
             fig.tight_layout()
-            fig.savefig(f"{context.somd2_config.output_directory}/pmf_evolution.png")
+            saved.append(
+                plot_writer.submit(
+                    fig.savefig,
+                    f"{context.somd2_config.output_directory}/pmf_evolution.png",
+                )
+            )
 
-        return converged
+        # Surface any errors from writing the figures
+        for future in saved:
+            future.result()
+
+    def _estimate_decorrelated_convergence(
+        self, extracted_dfs: list, convergence_df: pd.DataFrame
+    ):
+        """Repeats the convergence analysis on decorrelated data, for reporting."""
+        # Subsampling is mostly NumPy work, so the lambda windows are decorrelated concurrently
+        with ThreadPoolExecutor(max_workers=min(32, len(extracted_dfs))) as executor:
+            extracted_decorrelated_dfs = list(
+                executor.map(preprocessing.decorrelate_u_nk, extracted_dfs)
+            )
+
+        try:
+            convergence_decorrelated_df = self._forward_backward_convergence(
+                "decorrelated", extracted_decorrelated_dfs
+            )
+            convergence_decorrelated_df = _convergence_to_kcalmol(
+                convergence_decorrelated_df
+            )
+        except ValueError as e:
+            _logger.error("Error in decorrelated convergence calculation: %s", e)
+            _logger.error("Falling back to using original convergence data.")
+            # Only read from here on, so there is no need for a copy
+            convergence_decorrelated_df = convergence_df
 
-    def _test_for_convergence(self, heuristics):
-        """Test function for comparing provided heuristics with self.optimization_heuristics"""
+        self.decorr_dg_estimate = convergence_decorrelated_df["Forward"].iloc[-1]
+
+        _logger.info("Computing heuristics for the decorrelated data")
+        self.estimated_decorr_heuristics = self._compute_heuristics(
+            convergence_decorrelated_df
+        )
+
+    def _forward_backward_convergence(
+        self, label: str, df_list: list, num: int = 2
+    ) -> pd.DataFrame:
+        """Runs the convergence analysis, warm-started from the previous attempt's free energies.
+
+        The heuristics only need the estimates from half and all of the data, so by default
+        only those two points are computed.
+        """
+        initial_f_k = self._last_f_k.get(label)
+        if initial_f_k is None or len(initial_f_k) != len(df_list[0].columns):
+            initial_f_k = "BAR"
+
+        convergence_df, self._last_f_k[label] = _forward_backward_convergence(
+            df_list, initial_f_k=initial_f_k, num=num
+        )
+        return convergence_df
+
+    def _test_for_convergence(self, heuristics, computed: dict = None):
+        """Test function for comparing provided heuristics with self.optimization_heuristics
+
+        heuristics can be a dict or an iterable of (heuristic, value) pairs, which is only
+        consumed up to the first heuristic that is not satisfied. If given, computed is
+        filled with the heuristics that were tested.
+        """
+        if isinstance(heuristics, dict):
+            heuristics = heuristics.items()
 
         # Check if all heuristics are satisfied with self.optimization_heuristics
-        for heuristic, value in heuristics.items():
+        for heuristic, value in heuristics:
+            if computed is not None:
+                computed[heuristic] = value
             _logger.debug(
-                f"Testing heuristic '{heuristic}': {value} > {self.optimization_heuristics[heuristic]}"
+                "Testing heuristic '%s': %s > %s",
+                heuristic,
+                value,
+                self.optimization_heuristics[heuristic],
             )
-            if value > self.optimization_heuristics[heuristic]:
-                _logger.debug(f"Heuristic '{heuristic}' not satisfied")
+            # Written as "not <=" so that heuristics which could not be computed (NaN)
+            # are treated as not satisfied
+            if not value <= self.optimization_heuristics[heuristic]:
+                _logger.debug("Heuristic '%s' not satisfied", heuristic)
                 return False
 
         return True
 
     def _execute(self, context: SimulationContext):
+        current_runtime = None
         for _ in range(self.optimization_attempts):
             converged = self._estimate_convergence(context)
             if converged:
                 _logger.info("Simulation converged!")
 
-                # Print the convergence results to a table
-                table = Table(title="Convergence Results")
-                table.add_column("Metric", justify="right", style="cyan", no_wrap=True)
-                table.add_column("Value (kcal/mol)", justify="right", style="green")
-                table.add_row("dG", str(round(self.dg_estimate, ndigits=2)))
-                for heuristic, value in self.estimated_heuristics.items():
-                    table.add_row(heuristic, str(round(value, ndigits=2)))
-                console = Console()
-                console.print(table)
-
-                # Print the decorrelated convergence results to a table
-                table = Table(title="Decorrelated Convergence Results")
-                table.add_column("Metric", justify="right", style="cyan", no_wrap=True)
-                table.add_column("Value (kcal/mol)", justify="right", style="green")
-                table.add_row("dG", str(round(self.decorr_dg_estimate, ndigits=2)))
-                for heuristic, value in self.estimated_decorr_heuristics.items():
-                    table.add_row(heuristic, str(round(value, ndigits=2)))
+                results = {
+                    "correlated": _rounded_results(
+                        self.dg_estimate, self.estimated_heuristics
+                    )
+                }
+                if self.decorr_dg_estimate is not None:
+                    results["decorrelated"] = _rounded_results(
+                        self.decorr_dg_estimate, self.estimated_decorr_heuristics
+                    )
+
+                # Print the (decorrelated) convergence results to tables
                 console = Console()
-                console.print(table)
+                for label, title in [
+                    ("correlated", "Convergence Results"),
+                    ("decorrelated", "Decorrelated Convergence Results"),
+                ]:
+                    if label not in results:
+                        continue
+                    table = Table(title=title)
+                    table.add_column(
+                        "Metric", justify="right", style="cyan", no_wrap=True
+                    )
+                    table.add_column("Value (kcal/mol)", justify="right", style="green")
+                    for metric, value in results[label].items():
+                        table.add_row(metric, str(value))
+                    console.print(table)
 
                 # store the results as a json
-                results = {
-                    "correlated": {
-                        "dG": round(self.dg_estimate, ndigits=2),
-                        **{
-                            heuristic: round(value, ndigits=2)
-                            for heuristic, value in self.estimated_heuristics.items()
-                        },
-                    },
-                    "decorrelated": {
-                        "dG": round(self.decorr_dg_estimate, ndigits=2),
-                        **{
-                            heuristic: round(value, ndigits=2)
-                            for heuristic, value in self.estimated_decorr_heuristics.items()
-                        },
-                    },
-                }
                 with open(
                     f"{context.somd2_config.output_directory}/convergence_results.json",
                     "w",
@@ -365,9 +651,18 @@ class OptimizeConvergence(WorkflowStep):
                 break
 
             else:
-                old_runtime = context.somd2_config.runtime
-                new_runtime = sr.u(old_runtime) + sr.u(self.optimization_runtime)
-                _logger.info(f"Extending runtime from {old_runtime} to {new_runtime}")
+                # Keep the runtime as a quantity, it is only formatted for the config
+                if current_runtime is None:
+                    current_runtime = sr.u(context.somd2_config.runtime)
+                new_runtime = current_runtime + self._optimization_runtime
+                _logger.info(
+                    "Extending runtime from %s to %s", current_runtime, new_runtime
+                )
                 context.somd2_config.restart = True
                 context.somd2_config.runtime = new_runtime.to_string()
+                current_runtime = new_runtime
                 _run_somd2_workflow(context=context)
+
+        # Checkpoint the extractions once the step is done, rather than on every attempt
+        if self.checkpoint_extraction:
+            self._save_extract_cache(context)
@@ -19,7 +19,6 @@
 # along with alchemate. If not, see <http://www.gnu.org/licenses/>.
 #####################################################################
 
-from copy import deepcopy
 import logging
 import numpy as np
 import sire as sr
@@ -31,6 +30,26 @@ from ._run_somd2 import _run_somd2_workflow
 
 _logger = logging.getLogger("alchemate.logger")
 
+# Outcomes of a single _optimize_matrix() pass
+_CONVERGED = "converged"  # every neighbouring pair is above the threshold
+_INSERTED = "inserted"  # new lambdas were inserted into the schedule
+_STALLED = "stalled"  # pairs remain below the threshold, but no lambda could be added
+
+
+def _load_sire_system(system):
+    """Returns system as a sire System, only loading it from its stream file if needed."""
+    if isinstance(system, sr.system.System):
+        return system
+    return sr.stream.load(system)
+
+
+def _perturbable_system(system):
+    """Returns a new system containing only the perturbable molecules of system."""
+    perturbable_mols = _load_sire_system(system).molecules("property is_perturbable")
+    vacuum_system = sr.system.System()
+    vacuum_system.add(perturbable_mols)
+    return vacuum_system
+
 
 class OptimizeLambdaProbabilities(WorkflowStep):
     """
@@ -54,12 +73,22 @@ class OptimizeLambdaProbabilities(WorkflowStep):
     _optimize_matrix(context):
         Reads the matrix and lambda schedule, identifies pairs with low
         probabilities, and inserts new lambda values to improve overlap/exchange rates.
+        Returns the lambda schedule and whether it converged, was extended or stalled.
 
     _execute(context):
         Runs the optimization workflow, updating the lambda schedule as needed and restoring
         the original system after optimization.
     """
 
+    __slots__ = (
+        "optimization_target",
+        "optimization_attempts",
+        "optimization_threshold",
+        "optimization_runtime",
+        "vacuum_optimization",
+        "_default_lambdas",
+    )
+
     def __init__(
         self,
         independent: bool = True,
@@ -76,74 +105,101 @@ class OptimizeLambdaProbabilities(WorkflowStep):
         self.optimization_runtime: str = optimization_runtime
         self.vacuum_optimization = vacuum_optimization
 
-    def _optimize_matrix(self, context: SimulationContext):
-        """Internal function to optimize matrix."""
+        # Evenly spaced schedule used while the SOMD2 config has no lambda_values
+        self._default_lambdas = None
+
+    def _lambda_values(self, context: SimulationContext) -> list:
+        """Returns the current lambda schedule, creating the default one only once."""
+        if context.somd2_config.lambda_values is not None:
+            return context.somd2_config.lambda_values
+
+        num_lambda = context.somd2_config.num_lambda
+        if self._default_lambdas is None or len(self._default_lambdas) != num_lambda:
+            self._default_lambdas = np.linspace(0, 1, num_lambda).tolist()
+        return self._default_lambdas
+
+    def _optimize_matrix(self, context: SimulationContext, lambda_values: list = None):
+        """Internal function to optimize matrix.
+
+        lambda_values is the schedule the matrix was computed with, read from the context
+        if not given. Returns the (possibly) updated lambda schedule, and the outcome of the
+        pass: _CONVERGED, _INSERTED or _STALLED.
+        """
         if self.optimization_target == "repex_matrix":
             try:
                 repex_matrix = (
                     context.somd2_config.output_directory / "repex_matrix.txt"
                 )
-                repex_matrix = np.loadtxt(repex_matrix)
-                matrix = repex_matrix
+                # Only the superdiagonal, i.e. neighbouring windows, needs to be kept
+                neighbour_probs = np.diagonal(np.loadtxt(repex_matrix), offset=1).copy()
             except Exception as e:
-                _logger.error(f"Error reading repex_matrix: {e}")
+                _logger.error("Error reading repex_matrix: %s", e)
         elif self.optimization_target == "overlap_matrix":
             try:
                 _, overlap_matrix = BSS.Relative.analyse(
                     str(context.somd2_config.output_directory)
                 )
-                overlap_matrix = overlap_matrix.tolist()
-                matrix = overlap_matrix
+                neighbour_probs = np.diagonal(
+                    np.asarray(overlap_matrix, dtype=np.float64), offset=1
+                ).copy()
             except Exception as e:
-                _logger.error(f"Error reading overlap_matrix: {e}")
+                _logger.error("Error reading overlap_matrix: %s", e)
         else:
-            _logger.error(f"Unknown optimization target: {self.optimization_target}")
+            _logger.error("Unknown optimization target: %s", self.optimization_target)
             raise NotImplementedError
 
-        if context.somd2_config.lambda_values is None:
-            lambda_values = np.linspace(0, 1, context.somd2_config.num_lambda).tolist()
-        else:
-            lambda_values = context.somd2_config.lambda_values
-
-        require_optimization = []
-        for i, row in enumerate(matrix):
-            if i < len(matrix) - 1:
-                exchange_prob = round(row[i + 1], ndigits=2)
-                _logger.info(
-                    f"Overlap/Exchange probability between window {i} and {i+1}: {exchange_prob}"
-                )
-                if exchange_prob < self.optimization_threshold:
-                    require_optimization.append((i, i + 1))
-                    _logger.warning(
-                        f"Low overlap/exchange probability detected ({exchange_prob})"
-                    )
+        if lambda_values is None:
+            lambda_values = self._lambda_values(context)
+
+        exchange_probs = np.round(neighbour_probs, decimals=2)
+        _logger.info(
+            "Overlap/Exchange probabilities between neighbouring windows: %s",
+            exchange_probs,
+        )
+        low_windows = np.flatnonzero(exchange_probs < self.optimization_threshold)
+        for i in low_windows:
+            _logger.warning(
+                "Low overlap/exchange probability detected between window %d and %d (%s)",
+                i,
+                i + 1,
+                exchange_probs[i],
+            )
+        if low_windows.size == 0:
+            _logger.info("No windows require optimization")
+            return lambda_values, _CONVERGED
+
+        require_optimization = [(i, i + 1) for i in low_windows.tolist()]
 
         _logger.info("Windows requiring optimization:")
         for window_pair in require_optimization:
-            _logger.info(f" - Window {window_pair[0]} and {window_pair[1]}")
+            _logger.info(" - Window %d and %d", window_pair[0], window_pair[1])
 
         # Insert a new lambda between lambda values that require optimization
-        new_lambdas = []
-        for i, j in require_optimization:
-            new_lambda = (lambda_values[i] + lambda_values[j]) / 2
-            new_lambdas.append(round(new_lambda, 3))
-
-        for new_lambda in new_lambdas:
-            lambda_values.append(new_lambda)
-
-        lambda_values = sorted(lambda_values)
-        _logger.info(f"New lambda values after optimization: {lambda_values}")
-        return lambda_values
+        lambdas = np.asarray(lambda_values, dtype=np.float64)
+        new_lambdas = np.round(
+            (lambdas[low_windows] + lambdas[low_windows + 1]) / 2, decimals=3
+        )
+
+        # np.unique also sorts, and drops midpoints that round onto an existing lambda
+        merged_lambdas = np.unique(np.concatenate([lambdas, new_lambdas]))
+        if merged_lambdas.size == lambdas.size:
+            _logger.warning(
+                "No new lambda values could be inserted, the optimization threshold of %s cannot be met",
+                self.optimization_threshold,
+            )
+            return lambda_values, _STALLED
+
+        lambda_values = merged_lambdas.tolist()
+        _logger.info("New lambda values after optimization: %s", lambda_values)
+        return lambda_values, _INSERTED
 
     def _execute(self, context: SimulationContext):
         if self.vacuum_optimization:
-            # Retain the original system
-            original_system = deepcopy(context.system)
-            sire_system = sr.stream.load(context.system)
-            perturbable_mols = sire_system.molecules("property is_perturbable")
-            system = sr.system.System()
-            system.add(perturbable_mols)
-            context.system = system
+            # Retain the original system, it is only rebound below and never modified, so
+            # a reference is enough
+            original_system = context.system
+            # Built on every run, so that in-place changes to the system are picked up
+            context.system = _perturbable_system(original_system)
 
         # Overwrite SOMD2 config with step specific params
         context.somd2_config.runtime = self.optimization_runtime
@@ -151,27 +207,31 @@ class OptimizeLambdaProbabilities(WorkflowStep):
         _logger.info(context.somd2_config)
         _run_somd2_workflow(context=context)
 
+        # Track the schedule locally, rather than reading it back from the config
+        lambda_values = self._lambda_values(context)
         for _ in range(self.optimization_attempts):
-            if context.somd2_config.lambda_values is None:
-                old_lambda_values = np.linspace(
-                    0, 1, context.somd2_config.num_lambda
-                ).tolist()
-            else:
-                old_lambda_values = context.somd2_config.lambda_values
-
-            optimized_lambda_values = self._optimize_matrix(context=context)
+            optimized_lambda_values, status = self._optimize_matrix(
+                context=context, lambda_values=lambda_values
+            )
 
             # Success condition test
-            if old_lambda_values == optimized_lambda_values:
+            if status == _CONVERGED:
                 _logger.info("Optimization successful!")
-
-                # Restore overwrite flag
-                context.somd2_config.overwrite = False
+                break
+            elif status == _STALLED:
+                _logger.warning(
+                    "Optimization stopped with windows still below the threshold"
+                )
                 break
             else:
+                # The schedule is the only setting that changes between attempts
                 context.somd2_config.lambda_values = optimized_lambda_values
+                lambda_values = optimized_lambda_values
                 _run_somd2_workflow(context=context)
 
+        # Restore overwrite flag
+        context.somd2_config.overwrite = False
+
         # Now restore the old system to prevent any modifications
         if self.vacuum_optimization:
             context.system = original_system
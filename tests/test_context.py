@@ -35,6 +35,26 @@ def test_pickle_saving_and_loading(tmp_path, mock_context):
     )
 
 
+def test_system_only_saved_when_reassigned(tmp_path, mock_context):
+    mock_context.save()
+    system_file = tmp_path / "alchemate_system.pkl"
+    inode = system_file.stat().st_ino
+
+    # Saving again without touching the system should leave the system file alone
+    mock_context.completed_steps.add("MockStep")
+    mock_context.save()
+    assert system_file.stat().st_ino == inode
+
+    # Reassigning the system should rewrite it
+    mock_context.system = "new_mock_system"
+    mock_context.save()
+    assert system_file.stat().st_ino != inode
+
+    loaded_context = SimulationContext.load(f"{tmp_path}/alchemate_context.pkl")
+    assert loaded_context.system == "new_mock_system"
+    assert "MockStep" in loaded_context.completed_steps
+
+
 @pytest.mark.xfail(
     reason="This is currently broken in SOMD2, due to: TypeError: Config.__init__() got an unexpected keyword argument 'perturbed_system_file' "
 )
@@ -70,3 +70,19 @@ def test_workflow_manager_stops_on_error(mock_context):
     # ASSERT
     # Check that the workflow was halted and returned None
     assert final_context is None
+
+
+def test_workflow_manager_runs_steps_added_after_construction(mock_context):
+    """
+    Tests that steps appended to workflow_steps after construction are still run.
+    """
+
+    manager = WorkflowManager(context=mock_context, workflow_steps=[MockStepOne()])
+    manager.workflow_steps.append(MockStepTwo())
+
+    # ACT
+    final_context = manager.execute()
+
+    # ASSERT
+    assert final_context is not None
+    assert "MockStepTwo" in final_context.completed_steps
@@ -1,6 +1,16 @@
+import pickle
 import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
 from somd2.config import Config as somd2_config
-from alchemate.steps.postprocessing import OptimizeConvergence
+from alchemlyb.postprocessors.units import to_kcalmol
+from alchemate.steps.postprocessing import (
+    OptimizeConvergence,
+    _convergence_to_kcalmol,
+    _rounded_results,
+    _scan_parquet_files,
+)
 from alchemate.context import SimulationContext
 
 
@@ -59,3 +69,151 @@ def test_optimizer_is_incorrect(mock_context, poor_convergence_data):
     )
     result = optimizer._test_for_convergence(poor_convergence_data)
     assert result is True
+
+
+def test_convergence_test_stops_at_first_failure(mock_context):
+    """Heuristics after the first unsatisfied one should not be computed."""
+    optimizer = OptimizeConvergence(
+        mock_context, optimization_heuristics={"estimator_error": 0.1, "dg_slope": 0.25}
+    )
+
+    def heuristics():
+        yield "estimator_error", 0.5
+        raise AssertionError("dg_slope should not be computed")
+
+    computed = {}
+    assert optimizer._test_for_convergence(heuristics(), computed=computed) is False
+    assert computed == {"estimator_error": 0.5}
+
+
+def test_convergence_test_fails_on_nan_heuristic(mock_context):
+    """A heuristic that could not be computed should not count as converged."""
+    optimizer = OptimizeConvergence(
+        mock_context, optimization_heuristics={"estimator_error": 0.1, "dg_slope": 0.25}
+    )
+
+    assert (
+        optimizer._test_for_convergence({"estimator_error": 0.05, "dg_slope": np.nan})
+        is False
+    )
+
+
+def test_scan_parquet_files(tmp_path):
+    """Parquet files should be found recursively, in sorted order, ignoring other files."""
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    for name in ["b.parquet", "a.parquet", "nested/deeper/c.parquet", "nested/d.txt"]:
+        (tmp_path / name).write_bytes(b"data")
+
+    found = _scan_parquet_files(tmp_path)
+
+    assert [path for path, _ in found] == sorted(
+        str(tmp_path / name)
+        for name in ["a.parquet", "b.parquet", "nested/deeper/c.parquet"]
+    )
+    assert all(stat.st_size == 4 for _, stat in found)
+
+
+def test_load_extract_cache(tmp_path):
+    """Checkpointed extractions should only be reused for the same temperature."""
+    cache_path = tmp_path / "extract_cache.pkl"
+    assert OptimizeConvergence._load_extract_cache(cache_path, 300.0) == {}
+
+    dataframes = {"lambda_0.parquet": (4, 1, "mock_df")}
+    with open(cache_path, "wb") as f:
+        pickle.dump({"temperature": 300.0, "dataframes": dataframes}, f)
+
+    assert OptimizeConvergence._load_extract_cache(cache_path, 300.0) == dataframes
+    assert OptimizeConvergence._load_extract_cache(cache_path, 310.0) == {}
+
+
+def test_extract_checkpoint_reused_by_next_instance(tmp_path, mock_context):
+    """A checkpointed extraction should be loaded by a new step, without parsing again."""
+    mock_context.somd2_config.output_directory = tmp_path
+    (tmp_path / "energy_traj_0.parquet").write_bytes(b"data")
+    df = pd.DataFrame({"u_nk": [1.0, 2.0]})
+
+    first = OptimizeConvergence(checkpoint_extraction=True)
+    with patch(
+        "alchemate.steps.postprocessing.BSS.Relative._somd2_extract", return_value=df
+    ) as mock_extract:
+        first._extract_somd2_parquet(mock_context)
+    mock_extract.assert_called_once()
+    first._save_extract_cache(mock_context)
+
+    second = OptimizeConvergence(checkpoint_extraction=True)
+    with patch(
+        "alchemate.steps.postprocessing.BSS.Relative._somd2_extract"
+    ) as mock_extract:
+        (extracted,) = second._extract_somd2_parquet(mock_context)
+    mock_extract.assert_not_called()
+    pd.testing.assert_frame_equal(extracted, df)
+
+
+def test_extract_checkpoint_is_opt_in(tmp_path, mock_context):
+    """Without checkpoint_extraction, nothing should be written to the output directory."""
+    mock_context.somd2_config.output_directory = tmp_path
+    (tmp_path / "energy_traj_0.parquet").write_bytes(b"data")
+
+    optimizer = OptimizeConvergence()
+    with patch(
+        "alchemate.steps.postprocessing.BSS.Relative._somd2_extract",
+        return_value=pd.DataFrame(),
+    ):
+        optimizer._extract_somd2_parquet(mock_context)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["energy_traj_0.parquet"]
+
+
+def test_convergence_warm_started_from_previous_attempt(mock_context):
+    """Each attempt should start MBAR from the free energies of the previous one."""
+    optimizer = OptimizeConvergence(mock_context)
+    df_list = [pd.DataFrame(columns=[0.0, 0.5, 1.0])]
+    f_k = np.array([0.0, 1.0, 2.0])
+
+    with patch(
+        "alchemate.steps.postprocessing._forward_backward_convergence",
+        return_value=(pd.DataFrame(), f_k),
+    ) as mock_convergence:
+        optimizer._forward_backward_convergence("correlated", df_list)
+        optimizer._forward_backward_convergence("correlated", df_list)
+        optimizer._forward_backward_convergence("decorrelated", df_list)
+
+    initial_guesses = [
+        call.kwargs["initial_f_k"] for call in mock_convergence.call_args_list
+    ]
+    assert isinstance(initial_guesses[0], str) and initial_guesses[0] == "BAR"
+    assert initial_guesses[1] is f_k
+    assert isinstance(initial_guesses[2], str) and initial_guesses[2] == "BAR"
+
+
+def test_convergence_to_kcalmol_matches_alchemlyb():
+    """The in-place conversion should match to_kcalmol, leaving data_fraction as is."""
+    convergence_df = pd.DataFrame(
+        {
+            "Forward": [3.0, 3.1],
+            "Forward_Error": [0.05, 0.04],
+            "Backward": [3.2, 3.1],
+            "Backward_Error": [0.05, 0.04],
+            "data_fraction": [0.5, 1.0],
+        }
+    )
+    convergence_df.attrs = {"temperature": 298.15, "energy_unit": "kT"}
+    expected = to_kcalmol(convergence_df)
+
+    converted = _convergence_to_kcalmol(convergence_df)
+
+    energy_columns = ["Forward", "Forward_Error", "Backward", "Backward_Error"]
+    np.testing.assert_allclose(converted[energy_columns], expected[energy_columns])
+    np.testing.assert_array_equal(converted["data_fraction"], [0.5, 1.0])
+    assert converted.attrs["energy_unit"] == "kcal/mol"
+
+
+def test_rounded_results():
+    """dG should come first, followed by the heuristics, all rounded to two decimals."""
+    results = _rounded_results(
+        np.float64(-3.14159), {"estimator_error": 0.0449, "dg_slope": 0.256}
+    )
+
+    assert results == {"dG": -3.14, "estimator_error": 0.04, "dg_slope": 0.26}
+    assert list(results) == ["dG", "estimator_error", "dg_slope"]
+    assert all(type(value) is float for value in results.values())
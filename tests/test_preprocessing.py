@@ -1,8 +1,14 @@
 import pytest
 import numpy as np
+from unittest.mock import Mock, patch
 from somd2.config import Config as somd2_config
 
-from alchemate.steps.preprocessing import OptimizeLambdaProbabilities
+from alchemate.steps.preprocessing import (
+    OptimizeLambdaProbabilities,
+    _CONVERGED,
+    _INSERTED,
+    _STALLED,
+)
 from alchemate.context import SimulationContext
 
 
@@ -56,7 +62,8 @@ def test_optimize_exchange_matrix_inserts_new_lambdas(
     )
 
     # Should insert new lambdas between pairs with <0.05 exchange prob
-    result = optimizer._optimize_matrix(mock_context)
+    result, status = optimizer._optimize_matrix(mock_context)
+    assert status == _INSERTED
 
     # Should add lambdas between 0-1, 2-3, so we should have 6 in total
     assert len(result) == 6
@@ -78,9 +85,66 @@ def test_optimize_exchange_matrix_no_new_lambdas(
     optimizer = OptimizeLambdaProbabilities(optimization_target="repex_matrix")
 
     # Should not insert any new lambdas
-    result = optimizer._optimize_matrix(mock_context)
+    result, status = optimizer._optimize_matrix(mock_context)
+    assert status == _CONVERGED
 
     assert len(result) == 4
 
     # Test that the lambda values have not changed
     assert result == pytest.approx([0.0, 0.333, 0.666, 1.00], abs=0.01)
+
+
+def test_optimize_exchange_matrix_skips_duplicate_lambdas(
+    tmp_path, mock_context, repex_matrix_high_prob
+):
+    """A midpoint that rounds onto an existing lambda should not be inserted twice."""
+    mock_context.somd2_config.output_directory = tmp_path
+    mock_context.somd2_config.lambda_values = [0.0, 0.25, 0.2502, 1.0]
+    matrix = repex_matrix_high_prob.copy()
+    matrix[1, 2] = matrix[2, 1] = 0.01
+    np.savetxt(tmp_path / "repex_matrix.txt", matrix)
+    optimizer = OptimizeLambdaProbabilities(optimization_target="repex_matrix")
+
+    result, status = optimizer._optimize_matrix(mock_context)
+
+    # The low pair is still below the threshold, which is not the same as converging
+    assert status == _STALLED
+    assert result == [0.0, 0.25, 0.2502, 1.0]
+
+
+def test_vacuum_system_rebuilt_after_in_place_change(mock_context):
+    """Changes made to the same system instance between runs should reach the vacuum system."""
+    system = Mock()
+    system.molecules.return_value = "original_molecules"
+    mock_context.system = system
+    optimizer = OptimizeLambdaProbabilities(optimization_attempts=1)
+
+    simulated = []
+    with (
+        patch(
+            "alchemate.steps.preprocessing._load_sire_system",
+            side_effect=lambda system: system,
+        ),
+        patch(
+            "alchemate.steps.preprocessing.sr.system.System",
+            side_effect=lambda: Mock(),
+        ),
+        patch(
+            "alchemate.steps.preprocessing._run_somd2_workflow",
+            side_effect=lambda context: simulated.append(context.system),
+        ),
+        patch.object(
+            OptimizeLambdaProbabilities,
+            "_optimize_matrix",
+            return_value=([0.0, 1.0], _CONVERGED),
+        ),
+    ):
+        optimizer._execute(mock_context)
+        system.molecules.return_value = "modified_molecules"
+        optimizer._execute(mock_context)
+
+    assert [vacuum.add.call_args.args[0] for vacuum in simulated] == [
+        "original_molecules",
+        "modified_molecules",
+    ]
+    assert mock_context.system is system
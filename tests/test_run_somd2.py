@@ -1,134 +1,299 @@
+import gc
+import importlib
+import multiprocessing
+import sys
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
-from queue import Empty
+from alchemate.steps import _run_somd2
 from alchemate.steps._run_somd2 import _run_somd2_workflow
-from alchemate.context import SimulationContext
+
+_SUCCESS = {"success": True}
+_ERROR = {"error": "Test error"}
+# A failed attempt followed by a successful restart
+_RESTART_SEQ = (_ERROR, _SUCCESS)
+# A failed attempt, a restart that exits without posting a result, then a success
+_MISSING_RESULT_SEQ = (_ERROR, EOFError, _SUCCESS)
 
 
 class TestRunSomd2Workflow:
     @pytest.fixture
     def mock_context(self):
-        context = Mock(spec=SimulationContext)
-        context.somd2_config = Mock()
-        context.system = Mock()
+        context = SimpleNamespace(somd2_config=Mock(), system="mock_system.s3")
         context.somd2_config.restart = False
         return context
 
-    @patch("alchemate.steps._run_somd2.multiprocessing.get_context")
-    def test_successful_execution_first_attempt(self, mock_get_context, mock_context):
-        # Setup
-        mock_ctx = Mock()
-        mock_get_context.return_value = mock_ctx
+    @pytest.fixture
+    def mock_ctx(self):
+        with patch("alchemate.steps._run_somd2._MP_CTX") as mock_ctx:
+            yield mock_ctx
 
-        mock_queue = Mock()
-        mock_queue.get.return_value = {"success": True}
-        mock_ctx.Queue.return_value = mock_queue
+    def test_successful_execution_first_attempt(self, mock_ctx, mock_context):
+        # Setup
+        mock_conn = Mock()
+        mock_conn.recv.return_value = _SUCCESS
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
 
-        mock_process = Mock()
-        mock_process.pid = 12345
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
         mock_ctx.Process.return_value = mock_process
 
         # Execute
-        _run_somd2_workflow(mock_context)
+        _run_somd2_workflow(mock_context, backoff_base=0)
 
         # Assert
         mock_process.start.assert_called_once()
         mock_process.join.assert_called_once()
-        mock_queue.get.assert_called_once_with(timeout=10)
+        mock_conn.recv.assert_called_once_with()
         assert mock_context.somd2_config.restart is False
-        mock_get_context.assert_called_with("spawn")
 
-    @patch("alchemate.steps._run_somd2.multiprocessing.get_context")
-    def test_restart_after_error(self, mock_get_context, mock_context):
+    def test_restart_after_error(self, mock_ctx, mock_context):
         # Setup
-        mock_ctx = Mock()
-        mock_get_context.return_value = mock_ctx
-
-        mock_queue = Mock()
-        mock_queue.get.side_effect = [
-            {"error": "Test error"},  # First hard attempt fails
-            {"success": True},  # Second hard attempt succeeds
-        ]
-        mock_ctx.Queue.return_value = mock_queue
-
-        mock_process = Mock()
-        mock_process.pid = 12345
+        mock_conn = Mock()
+        mock_conn.recv.side_effect = iter(_RESTART_SEQ)
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
         mock_ctx.Process.return_value = mock_process
 
         # Execute
-        _run_somd2_workflow(mock_context, max_restarts=1)
+        _run_somd2_workflow(mock_context, max_restarts=1, backoff_base=0)
 
         # Assert
         assert mock_process.start.call_count == 2
         assert mock_process.join.call_count == 2
-        mock_get_context.assert_called_with("spawn")
 
-    @patch("alchemate.steps._run_somd2.multiprocessing.get_context")
-    def test_all_attempts_fail_raises_runtime_error(
-        self, mock_get_context, mock_context
+    def test_missing_result_handling(self, mock_ctx, mock_context):
+        # Setup
+        mock_conn = Mock()
+        mock_conn.recv.side_effect = iter(_MISSING_RESULT_SEQ)
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
+        mock_ctx.Process.return_value = mock_process
+
+        # Execute
+        _run_somd2_workflow(mock_context, max_restarts=3, backoff_base=0)
+
+        # Assert
+        assert mock_process.start.call_count == 3
+
+    @pytest.mark.parametrize("recv_result", [_SUCCESS, _ERROR])
+    @patch("alchemate.steps._run_somd2.time.sleep")
+    def test_zero_restarts_single_attempt(
+        self, mock_sleep, mock_ctx, mock_context, recv_result
     ):
         # Setup
-        mock_ctx = Mock()
-        mock_get_context.return_value = mock_ctx
+        mock_conn = Mock()
+        mock_conn.recv.return_value = recv_result
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
+        mock_ctx.Process.return_value = mock_process
 
-        mock_queue = Mock()
-        mock_queue.get.return_value = {"error": "Persistent error"}
-        mock_ctx.Queue.return_value = mock_queue
+        # Execute
+        if "error" in recv_result:
+            with pytest.raises(RuntimeError):
+                _run_somd2_workflow(mock_context, max_restarts=0)
+        else:
+            _run_somd2_workflow(mock_context, max_restarts=0)
 
-        mock_process = Mock()
-        mock_process.pid = 12345
+        # Assert a single attempt was made, without restarting or backing off
+        assert mock_process.start.call_count == 1
+        assert mock_context.somd2_config.restart is False
+        mock_sleep.assert_not_called()
+
+    @pytest.mark.parametrize("max_restarts", [1, 3])
+    def test_all_attempts_fail_raises_runtime_error(
+        self, mock_ctx, mock_context, max_restarts
+    ):
+        # Setup
+        mock_conn = Mock()
+        mock_conn.recv.return_value = _ERROR
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
         mock_ctx.Process.return_value = mock_process
 
         # Execute & Assert
         with pytest.raises(
             RuntimeError, match="SOMD2 workflow failed after multiple attempts"
         ):
-            _run_somd2_workflow(mock_context, max_restarts=1)
-        mock_get_context.assert_called_with("spawn")
+            _run_somd2_workflow(mock_context, max_restarts=max_restarts, backoff_base=0)
 
-    @patch("alchemate.steps._run_somd2.multiprocessing.get_context")
-    def test_queue_timeout_handling(self, mock_get_context, mock_context):
-        # Setup
-        mock_ctx = Mock()
-        mock_get_context.return_value = mock_ctx
-
-        mock_queue = Mock()
-        mock_queue.get.side_effect = [
-            {"error": "Test error"},  # Hard attempt fails
-            Empty(),  # Soft restart times out
-            {"success": True},  # Next soft restart succeeds
-        ]
-        mock_ctx.Queue.return_value = mock_queue
-
-        mock_process = Mock()
-        mock_process.pid = 12345
+        # The first attempt plus every restart attempt
+        assert mock_process.start.call_count == max_restarts + 1
+
+    def test_gc_paused_around_process_start(self, mock_ctx, mock_context):
+        # Setup, recording the order in which collection and the child are handled
+        calls = []
+        mock_conn = Mock()
+        mock_conn.recv.side_effect = lambda: calls.append("recv") or _SUCCESS
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(
+            pid=12345,
+            exitcode=0,
+            start=Mock(side_effect=lambda: calls.append("start")),
+            join=Mock(side_effect=lambda: calls.append("join")),
+        )
         mock_ctx.Process.return_value = mock_process
 
         # Execute
-        _run_somd2_workflow(mock_context, max_restarts=3)
+        with (
+            patch(
+                "alchemate.steps._run_somd2.gc.disable",
+                side_effect=lambda: calls.append("gc.disable"),
+            ),
+            patch(
+                "alchemate.steps._run_somd2.gc.enable",
+                side_effect=lambda: calls.append("gc.enable"),
+            ),
+            patch("alchemate.steps._run_somd2.gc.isenabled", return_value=True),
+        ):
+            _run_somd2_workflow(mock_context, backoff_base=0)
+
+        # Assert collection is only paused around start(), and resumed before waiting
+        assert calls == ["gc.disable", "start", "gc.enable", "recv", "join"]
+
+    def test_gc_reenabled_after_failed_start(self, mock_ctx, mock_context):
+        # Setup
+        mock_ctx.Pipe.return_value = (Mock(), Mock())
+
+        mock_process = SimpleNamespace(
+            pid=12345,
+            exitcode=None,
+            start=Mock(side_effect=OSError("Cannot start process")),
+            join=Mock(),
+        )
+        mock_ctx.Process.return_value = mock_process
+
+        # Execute & Assert
+        with pytest.raises(OSError):
+            _run_somd2_workflow(mock_context, backoff_base=0)
+        assert gc.isenabled() is True
+
+    def test_child_crash_detected_fast(self, mock_ctx, mock_context):
+        # Setup, a real pipe whose sending end the parent closes, like a crashed child
+        mock_ctx.Pipe.return_value = multiprocessing.Pipe(duplex=False)
+
+        mock_process = SimpleNamespace(
+            pid=12345, exitcode=-11, start=Mock(), join=Mock()
+        )
+        mock_ctx.Process.return_value = mock_process
+
+        # Execute, recv() sees EOF straight away rather than waiting on a timeout
+        result = _run_somd2._run_somd2_attempt(mock_context, mock_context.system)
 
         # Assert
-        assert mock_process.start.call_count == 3
-        mock_get_context.assert_called_with("spawn")
+        assert "exited with code -11" in result["error"]
+        mock_process.join.assert_called_once()
 
-    @patch("alchemate.steps._run_somd2.multiprocessing.get_context")
-    def test_custom_restart_limits(self, mock_get_context, mock_context):
+    @patch("alchemate.steps._run_somd2.sr.stream.save")
+    def test_in_memory_system_staged_once(
+        self, mock_stream_save, mock_ctx, mock_context
+    ):
         # Setup
-        mock_ctx = Mock()
-        mock_get_context.return_value = mock_ctx
+        mock_context.system = Mock()  # an in-memory system rather than a file path
 
-        mock_queue = Mock()
-        mock_queue.get.return_value = {"error": "Test error"}
-        mock_ctx.Queue.return_value = mock_queue
+        mock_conn = Mock()
+        mock_conn.recv.side_effect = iter(_RESTART_SEQ)
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
 
-        mock_process = Mock()
-        mock_process.pid = 12345
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
         mock_ctx.Process.return_value = mock_process
 
-        # Execute & Assert
+        # Execute
+        _run_somd2_workflow(mock_context, max_restarts=1, backoff_base=0)
+
+        # Assert the system was streamed to disk once, and both attempts got its path
+        mock_stream_save.assert_called_once()
+        staged_path = mock_stream_save.call_args.args[1]
+        for call in mock_ctx.Process.call_args_list:
+            assert call.kwargs["args"][1] == staged_path
+
+    @patch(
+        "alchemate.steps._run_somd2.random.uniform", side_effect=lambda low, high: high
+    )
+    @patch("alchemate.steps._run_somd2.time.sleep")
+    def test_backoff_increases(self, mock_sleep, mock_uniform, mock_ctx, mock_context):
+        # Setup
+        mock_conn = Mock()
+        mock_conn.recv.return_value = _ERROR
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
+        mock_ctx.Process.return_value = mock_process
+
+        # Execute
+        with pytest.raises(RuntimeError):
+            _run_somd2_workflow(mock_context, max_restarts=7, backoff_base=1.0)
+
+        # Assert the upper envelope of the delays doubles every restart, up to the cap
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+
+    @patch("alchemate.steps._run_somd2.time.sleep")
+    def test_backoff_disabled_in_tests(self, mock_sleep, mock_ctx, mock_context):
+        # Setup
+        mock_conn = Mock()
+        mock_conn.recv.return_value = _ERROR
+        mock_ctx.Pipe.return_value = (mock_conn, Mock())
+
+        mock_process = SimpleNamespace(pid=12345, exitcode=0, start=Mock(), join=Mock())
+        mock_ctx.Process.return_value = mock_process
+
+        # Execute
         with pytest.raises(RuntimeError):
-            _run_somd2_workflow(mock_context, max_restarts=3)
+            _run_somd2_workflow(mock_context, max_restarts=3, backoff_base=0)
 
-        # Should have 3 attempts in total
+        # Assert
         assert mock_process.start.call_count == 4
-        mock_get_context.assert_called_with("spawn")
+        mock_sleep.assert_not_called()
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver", "fork"])
+def test_start_method_environment_override(monkeypatch, start_method):
+    monkeypatch.setenv("ALCHEMATE_MP_CONTEXT", start_method)
+    try:
+        with patch("multiprocessing.get_context") as mock_get_context:
+            importlib.reload(_run_somd2)
+
+        assert _run_somd2._START_METHOD == start_method
+        mock_get_context.assert_called_once_with(start_method)
+    finally:
+        monkeypatch.delenv("ALCHEMATE_MP_CONTEXT")
+        importlib.reload(_run_somd2)
+
+
+def test_invalid_start_method_falls_back_to_default(monkeypatch, caplog):
+    monkeypatch.setenv("ALCHEMATE_MP_CONTEXT", "forkservr")
+    try:
+        with patch("multiprocessing.get_context") as mock_get_context:
+            importlib.reload(_run_somd2)
+
+        expected = "forkserver" if sys.platform == "linux" else "spawn"
+        assert _run_somd2._START_METHOD == expected
+        mock_get_context.assert_called_once_with(expected)
+        assert "ALCHEMATE_MP_CONTEXT" in caplog.text
+    finally:
+        monkeypatch.delenv("ALCHEMATE_MP_CONTEXT")
+        importlib.reload(_run_somd2)
+
+
+@pytest.mark.skipif(
+    sys.platform != "linux", reason="forkserver is only the default on Linux"
+)
+def test_forkserver_preload_set(monkeypatch):
+    monkeypatch.delenv("ALCHEMATE_MP_CONTEXT", raising=False)
+    try:
+        with patch("multiprocessing.get_context") as mock_get_context:
+            importlib.reload(_run_somd2)
+
+        mock_get_context.assert_called_once_with("forkserver")
+        mock_ctx = mock_get_context.return_value
+        mock_ctx.set_forkserver_preload.assert_called_once()
+        preload = mock_ctx.set_forkserver_preload.call_args.args[0]
+        assert "sire" in preload
+        assert "somd2" in preload
+    finally:
+        importlib.reload(_run_somd2)